@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
-import copy
+import functools
 import importlib
-import itertools
+import operator
 import random
 import sys
 
@@ -70,83 +70,203 @@ def _print_basic_help():
     print('# type "?" or "h" for help')
 
 
-def _match_cmd(cmd, pattern, argv_out=None):
+def _parse_cmd_args(cmd, arg_types):
     cmd_0, cmd = cmd[0], cmd[1:]
-    pattern_0, pattern = pattern[0], pattern[1:]
 
-    if cmd_0 != pattern_0:
-        return False
-
-    if len(cmd) != len(pattern):
+    if len(cmd) != len(arg_types):
         print('[Error] Invalid number of arguments for command "',
-              cmd_0, '": ', len(cmd), ' != ', len(pattern),
+              cmd_0, '": ', len(cmd), ' != ', len(arg_types),
               sep='')
-        return False
+        return None
 
-    for cmd_n, pattern_n in zip(cmd, pattern):
+    argv = []
+    for cmd_n, arg_type in zip(cmd, arg_types):
         try:
-            argv_n = pattern_n(cmd_n)
+            argv.append(arg_type(cmd_n))
         except ValueError:
-            if hasattr(pattern_n, 'type_name'):
-                type_name = pattern_n.type_name()
+            if hasattr(arg_type, 'type_name'):
+                type_name = arg_type.type_name()
             else:
-                type_name = pattern_n.__name__
+                type_name = arg_type.__name__
             print('[Error] Argument %r is not of type' % (cmd_n, ),
                   type_name)
-            return False
-
-        if argv_out is not None:
-            argv_out.append(argv_n)
+            return None
+
+    return argv
+
+
+@functools.lru_cache(maxsize=None)
+def _build_patterns(width, height):
+    # Pattern N flips bit N and its neighbours. Bits are numbered from the
+    # bottom right corner, so left neighbour is at N + 1, upper one is at
+    # N + width.
+    patterns = []
+    for y in range(height - 1, -1, -1):
+        for x in range(width - 1, -1, -1):
+            pat_n = len(patterns)
+
+            pat = 0b1 << pat_n
+            if x:
+                pat |= 0b1 << (pat_n + 1)
+            if x < width - 1:
+                pat |= 0b1 << (pat_n - 1)
+            if y:
+                pat |= 0b1 << (pat_n + width)
+            if y < height - 1:
+                pat |= 0b1 << (pat_n - width)
+
+            patterns.append(pat)
+
+    return tuple(patterns)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_cell_tables(width, height):
+    # Bit and pattern tables indexed by cell number (y * width + x) instead
+    # of bit number. Cells are numbered from the top left corner, so this is
+    # just the reversed order of bits.
+    cell_bits = tuple(
+        0b1 << bit_n for bit_n in range(width * height - 1, -1, -1))
+    cell_patterns = _build_patterns(width, height)[::-1]
+    return cell_bits, cell_patterns
+
+
+@functools.lru_cache(maxsize=None)
+def _build_bit_coords(width, height):
+    # Cell coordinates indexed by bit number.
+    return tuple(
+        (x, y)
+        for y in range(height - 1, -1, -1)
+        for x in range(width - 1, -1, -1))
+
+
+def _gf2_solve(rows, n_cols):
+    # Solve system of linear equations over GF(2) with Gauss-Jordan
+    # elimination. Each row is an int with coefficients in bits
+    # 0..(n_cols - 1) and the right-hand side in bit n_cols. Rows are
+    # modified in place. Returns None if system is inconsistent, or particular
+    # solution and basis of the kernel otherwise.
+    rhs_bit = 0b1 << n_cols
+    n_rows = len(rows)
+
+    pivot_cols = []
+    for col_n in range(n_cols):
+        col_bit = 0b1 << col_n
+        n_pivots = len(pivot_cols)
+
+        for row_n in range(n_pivots, n_rows):
+            if rows[row_n] & col_bit:
+                break
+        else:
+            # Free column.
+            continue
 
-    return True
+        rows[n_pivots], rows[row_n] = rows[row_n], rows[n_pivots]
+        pivot_row = rows[n_pivots]
+        for row_n in range(n_rows):
+            if (row_n != n_pivots) and (rows[row_n] & col_bit):
+                rows[row_n] ^= pivot_row
+
+        pivot_cols.append(col_n)
+
+    # All non-pivot rows have zero coefficients now. Non-zero right-hand side
+    # in any of them means that system is inconsistent.
+    if any(rows[len(pivot_cols):]):
+        return None
+
+    particular = 0b0
+    for row, col_n in zip(rows, pivot_cols):
+        if row & rhs_bit:
+            particular |= 0b1 << col_n
+
+    # Each free column gives one basis vector of the kernel.
+    kernel = []
+    for free_col_n in sorted(set(range(n_cols)) - set(pivot_cols)):
+        free_col_bit = 0b1 << free_col_n
+        vec = free_col_bit
+        for row, col_n in zip(rows, pivot_cols):
+            if row & free_col_bit:
+                vec |= 0b1 << col_n
+        kernel.append(vec)
+
+    return particular, kernel
+
+
+@functools.lru_cache(maxsize=None)
+def _build_kernel(width, height):
+    # Sets of patterns which do not change the board at all. Depends only on
+    # the board size.
+    _, kernel = _gf2_solve(list(_build_patterns(width, height)),
+                           width * height)
+    return tuple(kernel)
+
+
+def _chase_lights(patterns, width, height, bits, presses):
+    # Apply patterns from "presses", then go down row by row and fix each
+    # disabled cell by applying pattern directly below it. Only the bottom
+    # row may have disabled cells afterwards. Returns all applied patterns
+    # and resulting bits.
+    pressed = presses
+    while pressed:
+        pat_bit = pressed & -pressed
+        bits ^= patterns[pat_bit.bit_length() - 1]
+        pressed ^= pat_bit
+
+    row_mask = (0b1 << width) - 1
+    for y in range(1, height):
+        below_shift = (height - y - 1) * width
+        disabled = ~(bits >> (below_shift + width)) & row_mask
+        while disabled:
+            cell_bit = disabled & -disabled
+            pat_n = cell_bit.bit_length() - 1 + below_shift
+            bits ^= patterns[pat_n]
+            presses |= 0b1 << pat_n
+            disabled ^= cell_bit
+
+    return presses, bits
+
+
+@functools.lru_cache(maxsize=None)
+def _build_chase_table(width, height):
+    # Light chasing is affine over GF(2): bottom row left after chasing board
+    # B with top row presses P is bottom(B, none) ^ bottom(solved, P) ^ full
+    # row. So P solves B exactly when bottom(solved, P) == bottom(B, none).
+    # Map each possible bottom(solved, P) to some P.
+    patterns = _build_patterns(width, height)
+    n_bits = width * height
+    row_mask = (0b1 << width) - 1
+    top_row_shift = n_bits - width
+
+    table = {}
+    for top_row_presses in range(0b1 << width):
+        _, bits = _chase_lights(
+            patterns, width, height, (0b1 << n_bits) - 1,
+            top_row_presses << top_row_shift)
+        table.setdefault(bits & row_mask, top_row_presses << top_row_shift)
+    return table
 
 
 class _Board(object):
-    def _bit_pos(self, x, y):
-        return (self._width - x - 1) + (self._height - y - 1) * self._width
-
-    def _bit(self, x, y):
-        return 0b1 << self._bit_pos(x, y)
-
-    def _init_patterns(self):
-        self._patterns = {}
-        self._patterns_bits = {}
-        for y in range(self._height):
-            for x in range(self._width):
-                pat_n = self._bit_pos(x, y)
-
-                pat = self._bit(x, y)
-                self._patterns_bits[pat_n] = {pat_n}
-                if x:
-                    pat |= self._bit(x - 1, y)
-                    self._patterns_bits[pat_n].add(self._bit_pos(x - 1, y))
-                if x < self._width - 1:
-                    pat |= self._bit(x + 1, y)
-                    self._patterns_bits[pat_n].add(self._bit_pos(x + 1, y))
-                if y:
-                    pat |= self._bit(x, y - 1)
-                    self._patterns_bits[pat_n].add(self._bit_pos(x, y - 1))
-                if y < self._height - 1:
-                    pat |= self._bit(x, y + 1)
-                    self._patterns_bits[pat_n].add(self._bit_pos(x, y + 1))
-
-                self._patterns[pat_n] = pat
-
     def __init__(self, width, height):
         self._width = width
         self._height = height
+        self._full_mask = (0b1 << (width * height)) - 1
 
-        self._bits = sum(
-            self._bit(x, y)
-            for y in range(self._height)
-            for x in range(self._width))
+        self._patterns = _build_patterns(width, height)
+        self._cell_bits, self._cell_patterns = _build_cell_tables(
+            width, height)
+        self._bit_coords = _build_bit_coords(width, height)
 
-        self._init_patterns()
+        self._bits = self._full_mask
 
     @property
     def n_bits(self):
         return self._width * self._height
 
+    @property
+    def bits(self):
+        return self._bits
+
     @property
     def width(self):
         return self._width
@@ -157,14 +277,12 @@ class _Board(object):
 
     def __repr__(self):
         str_bits = '{:b}'.format(self._bits).zfill(self.n_bits)
-        split_str_bits = []
-        for row in range(self._height):
-            split_str_bits.append(
-                str_bits[row * self._width:(row + 1) * self._width])
-        return ' '.join(split_str_bits)
+        return ' '.join(
+            str_bits[row_start:row_start + self._width]
+            for row_start in range(0, self.n_bits, self._width))
 
     def is_solved(self):
-        return all((self._bits >> n) & 0b1 for n in range(self.n_bits))
+        return self._bits == self._full_mask
 
     def to_str(self, highlight_coords=()):
         if self.is_solved():
@@ -175,116 +293,109 @@ class _Board(object):
             v_char = '|'
 
         h_line = '  ' + h_char * (4 + 3 * (self._width - 1))
+        h_coords = '  ' + ''.join(
+            ' ' + chr(ord('a') + x) + ' ' for x in range(self._width))
+
+        cells = str.maketrans({
+            '1': '\u2592' * 2 + v_char,
+            '0': ' ' * 2 + v_char,
+        })
+        highlighted_cells = str.maketrans({
+            '1': '\u2588' * 2 + v_char,
+            '0': '\u2573' * 2 + v_char,
+        })
 
-        h_coords = '  '
-        for x in range(self._width):
-            h_coords += ' ' + chr(ord('a') + x) + ' '
-
-        str_board = h_coords + '\n'
+        str_bits = '{:b}'.format(self._bits).zfill(self.n_bits)
 
+        lines = [h_coords]
         for y in range(self._height):
-            str_board += h_line + '\n%u ' % (y + 1, ) + v_char
-
-            for x in range(self._width):
-                if (x, y) in highlight_coords:
-                    cell_on = '\u2588' * 2
-                    cell_off = '\u2573' * 2
-                else:
-                    cell_on = '\u2592' * 2
-                    cell_off = ' ' * 2
-
-                if self._bits & self._bit(x, y):
-                    str_board += cell_on
-                else:
-                    str_board += cell_off
-                str_board += v_char
+            str_row = str_bits[y * self._width:(y + 1) * self._width]
+            if any((x, y) in highlight_coords for x in range(self._width)):
+                str_row = ''.join(
+                    str_cell.translate(
+                        highlighted_cells if (x, y) in highlight_coords
+                        else cells)
+                    for x, str_cell in enumerate(str_row))
+            else:
+                str_row = str_row.translate(cells)
 
-            str_board += '\n'
+            lines.append(h_line)
+            lines.append('%u ' % (y + 1, ) + v_char + str_row)
 
-        str_board += h_line
+        lines.append(h_line)
 
-        return str_board
+        return '\n'.join(lines)
 
     def __str__(self):
         return self.to_str()
 
     def apply_n_rand(self, n_changes):
-        for pat in random.sample(list(self._patterns.values()), n_changes):
-            self._bits ^= pat
+        self._bits ^= functools.reduce(
+            operator.xor, random.sample(self._patterns, n_changes))
 
     def apply_pattern(self, x, y):
-        self._bits ^= self._patterns[self._bit_pos(x, y)]
+        self._bits ^= self._cell_patterns[y * self._width + x]
 
     def set_bits(self, bits):
         self._bits = bits
 
     def set_cell(self, x, y, v):
+        bit = self._cell_bits[y * self._width + x]
         if v:
-            self._bits |= self._bit(x, y)
+            self._bits |= bit
         else:
-            self._bits &= ~self._bit(x, y)
-
-    def _combine_constraint_sets(self, constraint_sets, bit_n=0,
-                                 prev_covered=0b0, prev_constraint=0b0):
-        if not constraint_sets:
-            yield prev_constraint
-            return
-
-        for constraint in constraint_sets[0]:
-            covered = self._patterns[bit_n]
-
-            if constraint & prev_covered == prev_constraint & covered:
-                for combined in self._combine_constraint_sets(
-                        constraint_sets[1:], bit_n + 1, prev_covered | covered,
-                        prev_constraint | constraint):
-                    yield combined
+            self._bits &= ~bit
 
     def _pattern_bits_to_coords(self, pattern_bits):
         steps = []
-        for y in range(self._height - 1, -1, -1):
-            for x in range(self._width - 1, -1, -1):
-                bit_v = pattern_bits & 0b1
-                pattern_bits >>= 1
-
-                if bit_v:
-                    steps.append((x, y))
+        while pattern_bits:
+            pat_bit = pattern_bits & -pattern_bits
+            steps.append(self._bit_coords[pat_bit.bit_length() - 1])
+            pattern_bits ^= pat_bit
 
         # Start walking from the top left corner.
         steps.reverse()
         return steps
 
-    def solve(self):
-        bits = self._bits
+    def _light_chase(self):
+        # Find any solution by light chasing. Returns set of patterns to
+        # apply, or None if puzzle is not solvable.
+        _, bits = _chase_lights(
+            self._patterns, self._width, self._height, self._bits, 0b0)
+        row_mask = (0b1 << self._width) - 1
 
-        constraint_sets = []
-        for bit_n in range(self.n_bits):
-            bit_v = bits & 0b1
-            bits >>= 1
+        top_row_presses = _build_chase_table(self._width, self._height).get(
+            bits & row_mask)
+        if top_row_presses is None:
+            return None
 
-            if bit_v:
-                # Bit was XORed even number of times.
-                lengths = range(0, len(self._patterns_bits[bit_n]) + 1, 2)
-            else:
-                # Bit was XORed odd number of times.
-                lengths = range(1, len(self._patterns_bits[bit_n]) + 1, 2)
-
-            constraint_set = set()
-            for l in lengths:
-                constraint_set |= set(
-                    sum(
-                        0b1 << pat_bit_n
-                        for pat_bit_n in pat_set)
-                    for pat_set in itertools.combinations(
-                        self._patterns_bits[bit_n], l))
-            constraint_sets.append(constraint_set)
-
-        solutions = list(
-            map(self._pattern_bits_to_coords,
-                self._combine_constraint_sets(constraint_sets)))
+        presses, bits = _chase_lights(
+            self._patterns, self._width, self._height, self._bits,
+            top_row_presses)
+        assert bits == self._full_mask, 'Light chasing failed'
+        return presses
+
+    def solve(self):
+        particular = self._light_chase()
+        if particular is None:
+            return []
+
+        # All other solutions differ from the found one by patterns which do
+        # not change the board.
+        kernel = _build_kernel(self._width, self._height)
+
+        # Walk all combinations of kernel vectors in Gray code order, so that
+        # each next solution differs from the previous one by exactly one
+        # vector.
+        pattern_bits = particular
+        pattern_bits_solutions = [pattern_bits]
+        for comb_n in range(1, 0b1 << len(kernel)):
+            pattern_bits ^= kernel[(comb_n & -comb_n).bit_length() - 1]
+            pattern_bits_solutions.append(pattern_bits)
 
         # Shortest solutions first.
-        solutions.sort(key=len)
-        return solutions
+        pattern_bits_solutions.sort(key=lambda pb: bin(pb).count('1'))
+        return list(map(self._pattern_bits_to_coords, pattern_bits_solutions))
 
 
 def _check_board(board):
@@ -337,12 +448,152 @@ class _Coord(object):
         return x, y
 
 
-def _match_board_set_cmd(cmd, board, argv_out):
-    if board is None:
-        return _match_cmd(cmd, ('s', ), argv_out)
-    else:
-        bits_conv = _Bits(board.width)
-        return _match_cmd(cmd, ['s'] + [bits_conv] * board.height, argv_out)
+# Converters depend only on board size, so keep them while board is the same.
+@functools.lru_cache(maxsize=1)
+def _coord_arg_types(board):
+    return (_Coord(board), )
+
+
+@functools.lru_cache(maxsize=1)
+def _board_set_arg_types(board):
+    return (_Bits(board.width), ) * board.height
+
+
+def _cmd_new(board, width, height):
+    if (width < 1) or (height < 1):
+        print('[Error] Board size must be >= 1')
+        return board
+    if (width > _MAX_BOARD_SIZE) or (height > _MAX_BOARD_SIZE):
+        print('[Error] Board size must be <=', _MAX_BOARD_SIZE)
+        return board
+
+    board = _Board(width, height)
+    print(board)
+    return board
+
+
+def _cmd_clear(board):
+    board.set_bits(0)
+    print(board)
+    return board
+
+
+def _cmd_print(board):
+    print(board)
+    return board
+
+
+def _cmd_print_bits(board):
+    print(repr(board))
+    return board
+
+
+def _cmd_rand(board, n_changes):
+    if n_changes < 1:
+        print('[Error] Number of random changes must be >= 1')
+        return board
+    if n_changes > board.n_bits:
+        print('[Error] Number of random changes must be <=', board.n_bits)
+        return board
+
+    board.apply_n_rand(n_changes)
+    print(board)
+    return board
+
+
+def _cmd_rand_rand(board):
+    board.apply_n_rand(random.randint(1, board.n_bits))
+    print(board)
+    return board
+
+
+def _cmd_set(board, *rows):
+    board.set_bits(
+        sum(
+            b << n * board.width
+            for b, n in zip(rows, range(board.height - 1, -1, -1))))
+    print(board)
+    return board
+
+
+def _cmd_enable(board, coord):
+    x, y = coord
+    board.set_cell(x, y, 1)
+    print(board)
+    return board
+
+
+def _cmd_disable(board, coord):
+    x, y = coord
+    board.set_cell(x, y, 0)
+    print(board)
+    return board
+
+
+def _cmd_flip(board, coord):
+    x, y = coord
+    board.apply_pattern(x, y)
+    print(board)
+    return board
+
+
+def _cmd_auto_solve(board):
+    solutions = board.solve()
+    if len(solutions) > 1:
+        print(
+            'More than one solution found:',
+            ', '.join(str(len(s)) + ' steps' for s in solutions))
+        print('Will show one of the shortest.')
+        print()
+    elif len(solutions) == 0:
+        print('Puzzle is not solvable =(')
+        return board
+    solution = solutions[0]
+
+    print(board)
+    print()
+
+    if not solution:
+        print('Already solved!')
+        return board
+
+    print('Steps:')
+    step_n = 0
+    for step_x, step_y in solution:
+        step_n += 1
+        print('%2u) f ' % (step_n, ),
+              chr(ord('a') + step_x), step_y + 1, sep='')
+    print()
+
+    # Demonstrate solution on the board itself and then restore its state.
+    saved_bits = board.bits
+    for step_x, step_y in solution:
+        board.apply_pattern(step_x, step_y)
+    assert board.is_solved(), 'Solver produced wrong solution'
+
+    print(board.to_str(set(solution)))
+    board.set_bits(saved_bits)
+    return board
+
+
+# Command name -> (handler, board is required, argument types). Argument
+# types are either a tuple of converters or a function which builds them
+# for the current board. Handlers receive the board and converted arguments
+# and return the (possibly new) board. Handler None means exit.
+_COMMANDS = {
+    'x': (None, False, ()),
+    'n': (_cmd_new, False, (int, int)),
+    'c': (_cmd_clear, True, ()),
+    'p': (_cmd_print, True, ()),
+    'pb': (_cmd_print_bits, True, ()),
+    'r': (_cmd_rand, True, (int, )),
+    'rr': (_cmd_rand_rand, True, ()),
+    's': (_cmd_set, True, _board_set_arg_types),
+    'e': (_cmd_enable, True, _coord_arg_types),
+    'd': (_cmd_disable, True, _coord_arg_types),
+    'f': (_cmd_flip, True, _coord_arg_types),
+    'a': (_cmd_auto_solve, True, ()),
+}
 
 
 def _shell(isatty):
@@ -368,131 +619,28 @@ def _shell(isatty):
             prev_cmd_had_output = False
             continue
 
-        cmd_argv = []
         if ('?' in cmd) or ('h' in cmd):
             _print_help()
-        elif _match_cmd(cmd, ('x', )):
-            break
-        elif _match_cmd(cmd, ('n', int, int), cmd_argv):
-            width, height = cmd_argv
-            if (width < 1) or (height < 1):
-                print('[Error] Board size must be >= 1')
-                continue
-            if (width > _MAX_BOARD_SIZE) or (height > _MAX_BOARD_SIZE):
-                print('[Error] Board size must be <=', _MAX_BOARD_SIZE)
-                continue
-
-            board = _Board(width, height)
-            print(board)
-        elif _match_cmd(cmd, ('c', )):
-            if not _check_board(board):
-                continue
-
-            board.set_bits(0)
-            print(board)
-        elif _match_cmd(cmd, ('p', )):
-            if not _check_board(board):
-                continue
-
-            print(board)
-        elif _match_cmd(cmd, ('pb', )):
-            if not _check_board(board):
-                continue
-
-            print(repr(board))
-        elif _match_cmd(cmd, ('r', int), cmd_argv):
-            if not _check_board(board):
-                continue
-
-            n_changes, = cmd_argv
-            if n_changes < 1:
-                print('[Error] Number of random changes must be >= 1')
-                continue
-            if n_changes > board.n_bits:
-                print('[Error] Number of random changes must be <=',
-                      board.n_bits)
-                continue
-
-            board.apply_n_rand(n_changes)
-            print(board)
-        elif _match_cmd(cmd, ('rr', )):
-            if not _check_board(board):
-                continue
-
-            board.apply_n_rand(random.randint(1, board.n_bits))
-            print(board)
-        elif _match_board_set_cmd(cmd, board, cmd_argv):
-            if not _check_board(board):
-                continue
-
-            board.set_bits(
-                sum(
-                    b << n * board.width
-                    for b, n in zip(
-                        cmd_argv,
-                        range(board.height - 1, -1, -1))))
-            print(board)
-        elif _match_cmd(cmd, ('e', _Coord(board)), cmd_argv):
-            if not _check_board(board):
-                continue
-
-            (x, y), = cmd_argv
-            board.set_cell(x, y, 1)
-            print(board)
-        elif _match_cmd(cmd, ('d', _Coord(board)), cmd_argv):
-            if not _check_board(board):
-                continue
-
-            (x, y), = cmd_argv
-            board.set_cell(x, y, 0)
-            print(board)
-        elif _match_cmd(cmd, ('f', _Coord(board)), cmd_argv):
-            if not _check_board(board):
-                continue
-
-            (x, y), = cmd_argv
-            board.apply_pattern(x, y)
-            print(board)
-        elif _match_cmd(cmd, ('a', )):
-            if not _check_board(board):
-                continue
-
-            solutions = board.solve()
-            if len(solutions) > 1:
-                print(
-                    'More than one solution found:',
-                    ', '.join(str(len(s)) + ' steps' for s in solutions))
-                print('Will show one of the shortest.')
-                print()
-            elif len(solutions) == 0:
-                print('Puzzle is not solvable =(')
-                continue
-            solution = solutions[0]
-
-            demo = copy.copy(board)
-            print(demo)
-            print()
+            continue
 
-            if not solution:
-                print('Already solved!')
-                continue
+        if cmd[0] not in _COMMANDS:
+            print('[Error] Unknown command %r' % (' '.join(cmd), ))
+            _print_basic_help()
+            continue
+        handler, needs_board, arg_types = _COMMANDS[cmd[0]]
 
-            print('Steps:')
-            step_n = 0
-            for step_x, step_y in solution:
-                step_n += 1
-                print('%2u) f ' % (step_n, ),
-                      chr(ord('a') + step_x), step_y + 1, sep='')
-            print()
+        if needs_board and not _check_board(board):
+            continue
 
-            for step_x, step_y in solution:
-                demo.apply_pattern(step_x, step_y)
-            assert demo.is_solved(), 'Solver produced wrong solution'
+        if callable(arg_types):
+            arg_types = arg_types(board)
+        cmd_argv = _parse_cmd_args(cmd, arg_types)
+        if cmd_argv is None:
+            continue
 
-            print(demo.to_str(set(solution)))
-        else:
-            print('[Error] Unknown command %r' % (' '.join(cmd), ))
-            _print_basic_help()
+        if handler is None:
+            break
+        board = handler(board, *cmd_argv)
 
 
 def _main():